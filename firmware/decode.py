@@ -2,33 +2,66 @@
 # Digit lines G0-G7 are active-high, with a period of 4.6ms
 # Segment lines Px are active-high.
 # Switch return lines Sx are active-low and are synced to G0-G3.
-from time import sleep_us
+from machine import idle
+import _thread
 import gpio_config
-from gpio_config import read_gpio_pins, BIT
+from gpio_config import BIT, GPIO_IN_ADDR
+import micropython
 from micropython import const
 import array
 from pwm import enable_pwm
+from _tables import SEG_TABLE, SEG_TABLE_DIGIT_1
+
+# Reserve memory so that an exception raised when the heap is exhausted,
+# such as a MemoryError in main_loop() on core 0, still gets its traceback.
+micropython.alloc_emergency_exception_buf(128)
 
 DEBUG = const(False)  # set to True to print results
 
 # Delay in microseconds to wait after a digit line goes high before reading the GPIO pin states.
 # Digit lines are high for 600us, then low for 4ms.
 _EDGE_DELAY_US = const(200)
+# Address of the RP2040 TIMERAWL register: the low 32 bits of the 1MHz system timer.
+_TIMERAWL_ADDR = const(0x40054028)
+# Number of frames in the ring buffer between core 1 and core 0; must be a power of two.
+_RING_SIZE = const(4)
+_RING_MASK = const(_RING_SIZE - 1)
 # Special segments that indicate that continuity is not present on the Fluke 8840A/8842A multimeter.
-NO_CONTINUITY = set(("OVER", "ERROR", "TEST", "CAL", "mA", "mV", "DC", "AC", "M", "k"))
+NO_CONTINUITY = frozenset(("OVER", "ERROR", "TEST", "CAL", "mA", "mV", "DC", "AC", "M", "k"))
 # Maximum resistance value that indicates continuity
 CONTINUITY_THRESHOLD = 10.0
 
 
-# import all the PIN_ constants from gpio_config.py into this module's namespace
-# as bit masks, translating gpio_config.PIN_XXX to XXX=BIT(XXX)
-for name in dir(gpio_config):
-    if name.startswith("PIN_"):
-        globals()[name[4:]] = BIT(getattr(gpio_config, name))
+# Bit masks of the display pins, translating gpio_config.PIN_XXX to XXX=BIT(PIN_XXX).
+# const() only folds names defined in the same file, so these are plain ints.
+G0 = BIT(gpio_config.PIN_G0)
+G1 = BIT(gpio_config.PIN_G1)
+G2 = BIT(gpio_config.PIN_G2)
+G3 = BIT(gpio_config.PIN_G3)
+G4 = BIT(gpio_config.PIN_G4)
+G5 = BIT(gpio_config.PIN_G5)
+G6 = BIT(gpio_config.PIN_G6)
+G7 = BIT(gpio_config.PIN_G7)
+PA = BIT(gpio_config.PIN_PA)
+PB = BIT(gpio_config.PIN_PB)
+PC = BIT(gpio_config.PIN_PC)
+PD = BIT(gpio_config.PIN_PD)
+PE = BIT(gpio_config.PIN_PE)
+PF = BIT(gpio_config.PIN_PF)
+PG = BIT(gpio_config.PIN_PG)
+PDP = BIT(gpio_config.PIN_PDP)
+PS1 = BIT(gpio_config.PIN_PS1)
+PS2 = BIT(gpio_config.PIN_PS2)
+PS3 = BIT(gpio_config.PIN_PS3)
 
 
 SEGMENT_MASK = PA | PB | PC | PD | PE | PF | PG
 DIGIT_MASK = G0 | G1 | G2 | G3 | G4 | G5 | G6 | G7
+# All the pins that the display drives; GPIO_IN also reads back the buzzer's PWM outputs.
+DISPLAY_PIN_MASK = DIGIT_MASK | SEGMENT_MASK | PDP | PS1 | PS2 | PS3
+
+# Digit line masks in digit order, as a buffer so that viper code can index it as a ptr32.
+DIGIT_MASKS = array.array("L", (G0, G1, G2, G3, G4, G5, G6, G7))
 
 # Keys: bit mask of the GPIO port reading for a digit
 # values: digit number
@@ -43,28 +76,19 @@ DIGIT_LOOKUP = {
     G7: 7,
 }
 
-# Lookup table to map the masked 32-bit GPIO port reading to a digit on the 7-segment display.
-# Digits 2-6 are normal 7-segment digits.
-SEGMENT_LOOKUP = {
-    (PA | PB | PC | PD | PE | PF): 0,
-    (PB | PC): 1,
-    (PA | PB | PD | PE | PG): 2,
-    (PA | PB | PC | PD | PG): 3,
-    (PB | PC | PF | PG): 4,
-    (PA | PC | PD | PF | PG): 5,
-    (PA | PC | PD | PE | PF | PG): 6,
-    (PA | PB | PC): 7,
-    (PA | PB | PC | PD | PE | PF | PG): 8,
-    (PA | PB | PC | PF | PG): 9,
-}
+# Segment pin numbers in packed bit order: PA is bit 0 through PG in bit 6.
+SEGMENT_SHIFTS = bytes(
+    (
+        gpio_config.PIN_PA,
+        gpio_config.PIN_PB,
+        gpio_config.PIN_PC,
+        gpio_config.PIN_PD,
+        gpio_config.PIN_PE,
+        gpio_config.PIN_PF,
+        gpio_config.PIN_PG,
+    )
+)
 
-# Digit 1 is the +1 or -1 digit.
-SEGMENT_LOOKUP_DIGIT_1 = {
-    (PA | PB | PC): 1,  # positive 1
-    (PA | PC): 1,  # negative 1
-    (PB | PC): 0,  # positive 0
-    (PC): 0,  # negative 0
-}
 
 SIGN_LOOKUP_DIGIT_1 = {
     (PB | PC): 1,  # positive
@@ -73,10 +97,10 @@ SIGN_LOOKUP_DIGIT_1 = {
 
 # Lookup table by digit number and GPIO pin number to map the masked 32-bit GPIO port reading
 # to the special segments on the 7-segment display.
-# Keys are digit numbers.
-# Values are tuples of (mask, (pin value(s), segment name) [, ...])
-SPECIAL_LOOKUP = {
-    0: (
+# Indexed by digit number.
+# Entries are tuples of (mask, (pin value(s), segment name) [, ...])
+SPECIAL_LOOKUP = (
+    (  # digit 0
         (PA | PB | PC | PD | PS1 | PS2 | PS3),  # mask
         (PA, "EX"),
         (PB, "TRIG"),
@@ -86,23 +110,23 @@ SPECIAL_LOOKUP = {
         (PS2, "LISTEN"),
         (PS3, "SRQ"),
     ),
-    1: (
+    (  # digit 1
         (PS1 | PS2 | PS3),  # mask
         (PS1, "rS"),  # slow
         (PS2, "rM"),  # medium
         (PS3, "rF"),  # fast
     ),
-    2: (PS1, (PS1, "OVER")),
-    3: (PS1, (PS1, "ERROR")),
-    4: (PS1, (PS1, "CAL")),
-    5: (PS1, (PS1, "AUTO")),
-    6: (
+    (PS1, (PS1, "OVER")),  # digit 2
+    (PS1, (PS1, "ERROR")),  # digit 3
+    (PS1, (PS1, "CAL")),  # digit 4
+    (PS1, (PS1, "AUTO")),  # digit 5
+    (  # digit 6
         (PS1 | PS2 | PS3),  # mask
         (PS1, "OFFSET"),
         (PS2, "m"),
         (PS3, "V"),
     ),
-    7: (
+    (  # digit 7
         (PA | PB | PC | PS1 | PS2 | PS3 | PDP),  # mask
         (PA, "mA"),
         (PB, "DC"),
@@ -112,60 +136,156 @@ SPECIAL_LOOKUP = {
         (PS3, "Ω"),
         (PDP, "4 WIRE"),
     ),
-}
-
-FORMAT_LOOKUP = [
-    [("m", "V", "DC"), "mV DC"],
-    [("m", "V", "AC"), "mV AC"],
-    [("V", "DC"), "V DC"],
-    [("V", "AC"), "V AC"],
-    [("k", "Ω"), "kΩ"],
-    [("M", "Ω"), "MΩ"],
-    [("Ω"), "Ω"],
-    [("mA", "DC"), "mA DC"],
-    [("mA", "AC"), "mA AC"],
-]
-
-
-def read_digit(digit_number, value) -> int:
-    """Given a 32-bit GPIO port reading, return the currently-displayed digit on the 7-segment display.
-    Assumes that the GPIO port reading is valid and that only one digit is active at a time.
-    Assumes that segment lines are active-high.
-    @param digit_number: int 0-7 corresponding to G0-G7 active
-    @param value: int reading from GPIO port"""
-    segment_lines = value & SEGMENT_MASK
-    # look up the digit in the table
-    return (
-        SEGMENT_LOOKUP_DIGIT_1.get(segment_lines, 0)
-        if digit_number == 1
-        else SEGMENT_LOOKUP.get(segment_lines, 0)
-    )
-
-
-def read_dp(digit_number, value) -> bool:
-    """Return True if the decimal point is active for the given digit number and GPIO port reading.
-    The only valid digit numbers are 1-6."""
-    if 1 <= digit_number <= 6:
-        return (value & PDP) == PDP  # active-high
-    return False
-
-
-def read_specials(digit_number: int, value) -> set:
-    """Return a set of strings representing the special segments
-    that are active for the given digit number and GPIO port reading."""
-    smask, *patterns = SPECIAL_LOOKUP.get(digit_number, (0,))
-    retval = set()
-    if smask == 0:
-        return retval
-    segment_lines = value & smask  # segment lines are active-high
-    for mask, name in patterns:
-        if segment_lines & mask == mask:
-            retval.add(name)
-    return retval
-
-
-def format_specials(specials: set) -> str:
-    """Format the specials set as a string, giving the range and units.
+)
+
+# Special segment names, in bit order of the specials bit mask.
+# The first eight determine the range and units.
+# The order is fixed by the BIT_ constants below, which are checked against it at import.
+SPECIAL_NAMES = (
+    "m",
+    "V",
+    "DC",
+    "AC",
+    "k",
+    "M",
+    "Ω",
+    "mA",
+    "OVER",
+    "ERROR",
+    "CAL",
+    "AUTO",
+    "OFFSET",
+    "4 WIRE",
+    "TEST",
+    "EX",
+    "TRIG",
+    "REMOTE",
+    "TALK",
+    "LISTEN",
+    "SRQ",
+    "rS",
+    "rM",
+    "rF",
+)
+
+# Bit flags for the specials that the code tests directly.
+BIT_m = const(1)
+BIT_V = const(2)
+BIT_DC = const(4)
+BIT_AC = const(8)
+BIT_k = const(16)
+BIT_M = const(32)
+BIT_OHM = const(64)
+BIT_mA = const(128)
+UNITS_MASK = const(0xFF)
+BIT_OVER = const(1 << 8)
+BIT_ERROR = const(1 << 9)
+
+# Keys: special segment names
+# values: bit flag
+TOKEN_BIT = {name: 1 << i for i, name in enumerate(SPECIAL_NAMES)}
+
+for name, bit in (
+    ("m", BIT_m),
+    ("V", BIT_V),
+    ("DC", BIT_DC),
+    ("AC", BIT_AC),
+    ("k", BIT_k),
+    ("M", BIT_M),
+    ("Ω", BIT_OHM),
+    ("mA", BIT_mA),
+    ("OVER", BIT_OVER),
+    ("ERROR", BIT_ERROR),
+):
+    if TOKEN_BIT[name] != bit:
+        raise ValueError("SPECIAL_NAMES order does not match the BIT_ flag for " + name)
+
+# Bit mask of the NO_CONTINUITY specials.
+NO_CONTINUITY_MASK = 0
+for name in NO_CONTINUITY:
+    NO_CONTINUITY_MASK |= TOKEN_BIT.get(name, 0)
+
+# Tuples of (unit bits, format), in order of priority.
+FORMAT_LOOKUP = (
+    (BIT_m | BIT_V | BIT_DC, "mV DC"),
+    (BIT_m | BIT_V | BIT_AC, "mV AC"),
+    (BIT_V | BIT_DC, "V DC"),
+    (BIT_V | BIT_AC, "V AC"),
+    (BIT_k | BIT_OHM, "kΩ"),
+    (BIT_M | BIT_OHM, "MΩ"),
+    (BIT_OHM, "Ω"),
+    (BIT_mA | BIT_DC, "mA DC"),
+    (BIT_mA | BIT_AC, "mA AC"),
+)
+
+
+def build_format_table() -> tuple:
+    """Return a 256-entry tuple mapping every combination of unit bits
+    to the format of the first FORMAT_LOOKUP pattern that it contains."""
+    table = []
+    for units in range(256):
+        result = ""
+        for pattern, fmt in FORMAT_LOOKUP:
+            if units & pattern == pattern:
+                result = fmt
+                break
+        table.append(result)
+    return tuple(table)
+
+
+# Indexed by the unit bits of the specials bit mask.
+FORMAT_BY_MASK = build_format_table()
+
+
+# De Bruijn multiplier: the top 5 bits of (1 << n) * _DEBRUIJN are different for every n.
+_DEBRUIJN = const(0x077CB531)
+
+
+def build_special_arrays() -> tuple:
+    """Flatten SPECIAL_LOOKUP for decode_specials() into a tuple of
+    (special segment mask of each digit, TOKEN_BIT flags indexed by digit_number * 32 + pin number,
+    pin numbers indexed by the top 5 bits of a single-pin mask times _DEBRUIJN)."""
+    masks = array.array("L", [0] * 8)
+    flags = array.array("L", [0] * 256)
+    debruijn = bytearray(32)
+    for pin in range(32):
+        debruijn[(((1 << pin) * _DEBRUIJN) >> 27) & 31] = pin
+    for digit_number in range(8):
+        smask, *patterns = SPECIAL_LOOKUP[digit_number]
+        masks[digit_number] = smask
+        for mask, name in patterns:
+            pin = debruijn[((mask * _DEBRUIJN) >> 27) & 31]
+            flags[digit_number * 32 + pin] = TOKEN_BIT[name]
+    return masks, flags, bytes(debruijn)
+
+
+SPECIAL_MASKS, SPECIAL_FLAGS, SPECIAL_PIN_NUMBERS = build_special_arrays()
+
+
+@micropython.viper
+def decode_specials(frame: ptr32) -> int:
+    """Return a bit mask of the TOKEN_BIT flags of the special segments
+    that are active in all 8 GPIO readings of a frame.
+    Assumes that segment lines are active-high."""
+    masks = ptr32(SPECIAL_MASKS)
+    flags = ptr32(SPECIAL_FLAGS)
+    pin_numbers = ptr8(SPECIAL_PIN_NUMBERS)
+    specials = 0
+    for digit_number in range(8):
+        segment_lines = frame[digit_number] & masks[digit_number]
+        base = digit_number << 5
+        # visit only the set bits, lowest first
+        while segment_lines:
+            bit = segment_lines & (0 - segment_lines)
+            # bits 27-31 of the product are the same whether or not it wraps at 32 bits
+            pin = pin_numbers[((bit * _DEBRUIJN) >> 27) & 31]
+            specials |= flags[base + pin]
+            segment_lines ^= bit
+    return specials
+
+
+def format_specials(specials: int) -> str:
+    """Format the unit bits of the specials bit mask as a string, giving the range and units.
     Outputs strings like:
     "V DC"
     "V AC"
@@ -173,10 +293,7 @@ def format_specials(specials: set) -> str:
     "mA DC"
     "mA AC"
     """
-    for pattern, result in FORMAT_LOOKUP:
-        if specials.issuperset(pattern):
-            return result
-    return ""
+    return FORMAT_BY_MASK[specials & UNITS_MASK]
 
 
 def read_digit_number(value) -> int:
@@ -186,68 +303,220 @@ def read_digit_number(value) -> int:
     return DIGIT_LOOKUP[value & DIGIT_MASK]
 
 
-def read_all_digit_gpios_into(arr: array.array):
+@micropython.viper
+def read_all_digit_gpios_into(arr: ptr32):
     """Read the states of the GPIO pins when each of the G0-G7 digit lines becomes active.
     Store the results in the given array.
+    Waits for the next G0 rising edge to start the frame, then waits for each digit's own edge
+    and spins on the system timer until _EDGE_DELAY_US after it, so drift in the display
+    timing does not add up over the frame.
     Assumes that digit lines are active-high."""
-    for digit_number, digit_mask in enumerate((G0, G1, G2, G3, G4, G5, G6, G7)):
+    gpio_in = ptr32(GPIO_IN_ADDR)
+    timer = ptr32(_TIMERAWL_ADDR)
+    masks = ptr32(DIGIT_MASKS)
+    g0_mask = masks[0]
+    # wait for G0 to go high after being low, which starts a display frame
+    while gpio_in[0] & g0_mask:
+        pass
+    for digit_number in range(8):
+        digit_mask = masks[digit_number]
         # wait until digit line goes high
-        while read_gpio_pins() & digit_mask == 0:
+        while gpio_in[0] & digit_mask == 0:
             pass
+        edge = timer[0]
         # wait a little bit for the signal to stabilize
-        sleep_us(_EDGE_DELAY_US)
+        while timer[0] - edge < _EDGE_DELAY_US:
+            pass
         # read the GPIO pin states
-        arr[digit_number] = read_gpio_pins()
+        value = gpio_in[0]
+        arr[digit_number] = value
 
 
-def make_float(digits, decimal_point_position, sign) -> float:
-    """Builds a floating point number from the digits and decimal point position"""
-    full_number = 0
-    for digit_number in range(1, 7):
-        full_number += abs(digits[digit_number])
-        full_number *= 10
-    # Now scale the number to the right place using decimal_point_position
-    full_number /= 10 ** (7 - decimal_point_position)
-    return full_number * sign
+# Frames of GPIO readings sampled by core 1, and the (head, tail) ring indexes.
+# Core 1 fills RING[head] and advances head; core 0 copies out RING[tail] and advances tail.
+RING = [array.array("L", [0] * 8) for _ in range(_RING_SIZE)]
+RING_INDEX = array.array("L", [0, 0])
 
 
-def read_all_digit_gpios(gpio_values: array.array, digits: array.array, specials: set):
-    """Generator that reads the GPIO pin states when each of the G0-G7 digit lines becomes active,
-    decodes the display, and yields the results."""
+@micropython.native
+def sample_frames():
+    """Sample every display frame into RING. Runs forever on core 1.
+    If core 0 falls behind, the newest unread frame is overwritten,
+    never the one that core 0 may be copying."""
+    _read_all_digit_gpios_into = read_all_digit_gpios_into
+    ring = RING
+    index = RING_INDEX
     while True:
-        specials.clear()
-        decimal_point_position = 0
-        read_all_digit_gpios_into(gpio_values)
-        for digit_number, value in enumerate(gpio_values):
-            digit = read_digit(digit_number, value)
-            digits[digit_number] = digit
-            if read_dp(digit_number, value):
-                decimal_point_position = digit_number
-            sp = read_specials(digit_number, value)
-            specials.update(sp)
-            # print(f"{digit_number} {value:08x} {digit} {sp}")
-        sign = SIGN_LOOKUP_DIGIT_1.get(gpio_values[1] & (PB | PC), 1)
-        yield make_float(digits, decimal_point_position, sign), specials
-
-
-def has_continuity(value: float, specials: set):
+        head = index[0]
+        _read_all_digit_gpios_into(ring[head])
+        next_head = (head + 1) & _RING_MASK
+        if next_head != index[1]:
+            index[0] = next_head
+
+
+def start_sampling():
+    """Start sampling display frames on core 1."""
+    _thread.start_new_thread(sample_frames, ())
+
+
+@micropython.viper
+def copy_frame(dst: ptr32, src: ptr32) -> int:
+    """Copy the 8 GPIO readings of a frame.
+    Return the OR of the XOR of each old and new reading on the display pins,
+    which is 0 if the display did not change."""
+    changed = 0
+    for i in range(8):
+        changed |= dst[i] ^ src[i]
+        dst[i] = src[i]
+    return changed & int(DISPLAY_PIN_MASK)
+
+
+@micropython.native
+def read_ring_frame_into(arr: array.array) -> int:
+    """Copy the oldest frame sampled by core 1 into the given array,
+    idling until one is available.
+    Return nonzero if any display pin reading differs from what the array held before."""
+    index = RING_INDEX
+    tail = index[1]
+    while index[0] == tail:
+        idle()
+    changed = copy_frame(arr, RING[tail])
+    index[1] = (tail + 1) & _RING_MASK
+    return changed
+
+
+# Divisors that scale the packed digits by decimal_point_position, which is 0 (none) or 1-6.
+# These are exact powers of ten, so a division rounds the same way as before.
+_SCALES = (1e6, 1e5, 1e4, 1e3, 1e2, 1e1, 1.0)
+
+
+@micropython.viper
+def pack_digits(digits: ptr8) -> int:
+    """Return digits 1-6 as a 6-digit integer, digit 1 being the most significant.
+    Digit 1 is only ever 0 or 1; the sign is kept separately."""
+    full_number = digits[1] * 10 + digits[2]
+    full_number = full_number * 10 + digits[3]
+    full_number = full_number * 10 + digits[4]
+    full_number = full_number * 10 + digits[5]
+    return full_number * 10 + digits[6]
+
+
+@micropython.viper
+def decode_digits(frame: ptr32, digits: ptr8) -> int:
+    """Decode digits 1-6 of a frame of GPIO readings into the given digits array,
+    digit 1 through SEG_TABLE_DIGIT_1 and digits 2-6 through SEG_TABLE.
+    The tables are generated by tools/gen_tables.py and indexed by the PA-PG segment bits
+    gathered into a 7-bit number, with PA in bit 0 through PG in bit 6.
+    Return the decimal point position, or 0 if no decimal point is lit.
+    Assumes that segment lines are active-high."""
+    shifts = ptr8(SEGMENT_SHIFTS)
+    s0 = shifts[0]
+    s1 = shifts[1]
+    s2 = shifts[2]
+    s3 = shifts[3]
+    s4 = shifts[4]
+    s5 = shifts[5]
+    s6 = shifts[6]
+    dp_mask = int(PDP)
+    normal_table = ptr8(SEG_TABLE)
+    table = ptr8(SEG_TABLE_DIGIT_1)
+    decimal_point_position = 0
+    for digit_number in range(1, 7):
+        value = frame[digit_number]
+        # unrolled and branchless: move each segment bit straight to its packed position
+        segments = (
+            ((value >> s0) & 1)
+            | (((value >> s1) & 1) << 1)
+            | (((value >> s2) & 1) << 2)
+            | (((value >> s3) & 1) << 3)
+            | (((value >> s4) & 1) << 4)
+            | (((value >> s5) & 1) << 5)
+            | (((value >> s6) & 1) << 6)
+        )
+        digits[digit_number] = table[segments]
+        if value & dp_mask:
+            decimal_point_position = digit_number
+        table = normal_table
+    return decimal_point_position
+
+
+@micropython.native
+def make_float(digits, decimal_point_position, sign) -> float:
+    """Builds a floating point number from the digits and decimal point position"""
+    # sign is folded into the divisor
+    return pack_digits(digits) / (_SCALES[decimal_point_position] * sign)
+
+
+def read_all_digit_gpios(gpio_values: array.array, digits: array.array):
+    """Generator that takes the GPIO pin states sampled by core 1 for each frame,
+    decodes the display, and yields (value, specials bit mask) for each frame."""
+    # cache globals as locals; global lookups are dict lookups in MicroPython
+    _read_ring_frame_into = read_ring_frame_into
+    _decode_digits = decode_digits
+    _decode_specials = decode_specials
+    _make_float = make_float
+    _sign_get = SIGN_LOOKUP_DIGIT_1.get
+    _PBPC = PB | PC
+    value = None
+    specials = 0
+    while True:
+        # The display usually shows the same thing for many frames;
+        # only decode when a reading has changed, and otherwise yield the last results again.
+        if not _read_ring_frame_into(gpio_values) and value is not None:
+            yield value, specials
+            continue
+        decimal_point_position = _decode_digits(gpio_values, digits)
+        specials = _decode_specials(gpio_values)
+        sign = _sign_get(gpio_values[1] & _PBPC, 1)
+        value = _make_float(digits, decimal_point_position, sign)
+        yield value, specials
+
+
+@micropython.native
+def has_continuity(value: float, specials: int):
     """Return True if the given value is a valid continuity reading."""
-    if not specials.isdisjoint(NO_CONTINUITY):
+    if specials & NO_CONTINUITY_MASK:
         return False
     return value <= CONTINUITY_THRESHOLD
 
 
 last_result = ""
+# Arguments behind last_result, so that unchanged frames skip formatting.
+last_value = None
+# -0.0 == 0.0, but they print differently
+last_sign = 0.0
+last_units = -1
+last_state = -1
+
 
-def print_result(value, specials: set, cont: bool):
+def print_result(value, specials: int, cont: bool):
     """For debug purposes, print the decoded value and specials."""
-    global last_result
-    if "OVER" in specials:
-        result = f"OVER {format_specials(specials)}"
-    elif "ERROR" in specials:
-        result = f"ERROR {value}"
+    global last_result, last_value, last_sign, last_units, last_state
+    # only needed with DEBUG set, so imported here rather than by the production path
+    from math import copysign
+
+    # 0: reading, 1: reading with continuity, 2: OVER, 3: ERROR
+    units = specials & UNITS_MASK
+    if specials & BIT_OVER:
+        state = 2
+    elif specials & BIT_ERROR:
+        state = 3
+    else:
+        state = 1 if cont else 0
+    sign = copysign(1.0, value)
+    if value == last_value and sign == last_sign and units == last_units and state == last_state:
+        return
+    last_value = value
+    last_sign = sign
+    last_units = units
+    last_state = state
+    # % formatting allocates less than f-strings on MicroPython
+    if state == 2:
+        result = "OVER %s" % format_specials(specials)
+    elif state == 3:
+        result = "ERROR %s" % value
     else:
-        result = f"{value:5f} {format_specials(specials)}{' *' if cont else ''}"
+        result = "%5f %s%s" % (value, format_specials(specials), " *" if cont else "")
     if result != last_result:
         print(result)
         last_result = result
@@ -264,9 +533,15 @@ def main_loop():
     digits = array.array(
         "b", [0, 0, 0, 0, 0, 0, 0, 0]
     )  # signed because of possible leading -1
-    specials = set()
-    for value, specials in read_all_digit_gpios(gpio_values, digits, specials):
-        cont = has_continuity(value, specials)
-        enable_pwm(cont)
+    _has_continuity = has_continuity
+    _enable_pwm = enable_pwm
+    # initialize_pwm() leaves the buzzer off
+    last_cont = False
+    for value, specials in read_all_digit_gpios(gpio_values, digits):
+        cont = _has_continuity(value, specials)
+        # only touch the PWM when the buzzer has to turn on or off
+        if cont != last_cont:
+            _enable_pwm(cont)
+            last_cont = cont
         if DEBUG:
             print_result(value, specials, cont)
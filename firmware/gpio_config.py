@@ -1,4 +1,5 @@
 # Definitions of GPIO pin names and numbers
+import micropython
 from micropython import const
 from machine import Pin, mem32
 
@@ -39,27 +40,56 @@ INPUT_PIN_MASK = const(0x03FFFFFF)  # mask for the 26 GPIO pins used as inputs
 # Address of the GPIO input register on the RP2040
 GPIO_IN_ADDR = const(0xD0000004)
 GPIO_OUT_ADDR = const(0xD0000010)
+GPIO_OUT_SET_ADDR = const(0xD0000014)
+GPIO_OUT_CLEAR_ADDR = const(0xD0000018)
 GPIO_OE_ADDR = const(0xD0000020)
 GPIO_OE_SET_ADDR = const(0xD0000024)
 GPIO_OE_CLEAR_ADDR = const(0xD0000028)
 
+# Pad control registers: GPIOn is at PADS_BANK0_ADDR + 4 + 4 * n
+PADS_BANK0_ADDR = const(0x4001C000)
+# Function select registers: GPIOn_CTRL is at IO_BANK0_ADDR + 4 + 8 * n
+IO_BANK0_ADDR = const(0x40014000)
+# Pad setting: input enabled, 4mA drive, pull-down enabled, Schmitt trigger (the reset value)
+PAD_PULL_DOWN = const(0x56)
+# GPIOn_CTRL function select for software-controlled I/O
+FUNCSEL_SIO = const(5)
+
 # Pins 0-4,6,8 are unused
 UNUSED_PINS = (0, 1, 2, 3, 4, 6, 8)
 # Two spare pins 26 and 27
 SPARE_PINS = (26, 27)
+# built from SPARE_PINS so that the two cannot disagree
+SPARE_PIN_MASK = 0
+for pin in SPARE_PINS:
+    SPARE_PIN_MASK |= 1 << pin
 
 PULL_NONE = 0 # not in Pin
 # pull-up and pull-down resistors are 50-80KΩ.
 # board has 200Ω series resistors on 30V inputs
 # with diode clamps to 3.3V.
 
+# Give the masked GPIO pins PAD_PULL_DOWN pads, controlled by SIO.
+@micropython.viper
+def _set_sio_pins(mask: int):
+    pads = ptr32(PADS_BANK0_ADDR)
+    ctrl = ptr32(IO_BANK0_ADDR)
+    for pin in range(30):
+        if mask & (1 << pin):
+            pads[1 + pin] = PAD_PULL_DOWN
+            ctrl[1 + 2 * pin] = FUNCSEL_SIO
+
+
 def initialize_pins():
     # Set all the GPIO pins to inputs with pull-down resistors.
-    for pin in range(26):
-        Pin(pin, Pin.IN, Pin.PULL_DOWN)
+    # The registers are written directly rather than constructing a Pin for each pin.
+    mem32[GPIO_OE_CLEAR_ADDR] = INPUT_PIN_MASK
+    _set_sio_pins(INPUT_PIN_MASK)
 
-    for pin in SPARE_PINS:
-        Pin(pin, Pin.OUT, value=0)
+    # Drive the spare pins low.
+    mem32[GPIO_OUT_CLEAR_ADDR] = SPARE_PIN_MASK
+    mem32[GPIO_OE_SET_ADDR] = SPARE_PIN_MASK
+    _set_sio_pins(SPARE_PIN_MASK)
 
     # Set the piezo buzzer pins to outputs.
     Pin(PIN_BUZZER1, Pin.OUT).value(0)
@@ -72,11 +102,13 @@ def read_gpio_pins() -> int:
 
 
 # Write a selected subset of the GPIO pins.
-# The mask selects which bits to write.
+# The mask selects which bits to write; the other outputs are left alone.
 def write_gpio_pins(mask, value) -> None:
+    # unlike a store to GPIO_OUT, the atomic set and clear aliases leave the unmasked outputs alone
+    mem32[GPIO_OUT_SET_ADDR] = value & mask
+    mem32[GPIO_OUT_CLEAR_ADDR] = ~value & mask
     # set the GPIO output direction to output
     mem32[GPIO_OE_SET_ADDR] = mask
-    mem32[GPIO_OUT_ADDR] = value
 
 
 # Stop writing the masked outputs.
@@ -4,5 +4,6 @@ import pwm
 
 gpio_config.initialize_pins()
 pwm.initialize_pwm()
+decode.start_sampling()
 
 decode.main_loop()
\ No newline at end of file
@@ -0,0 +1,10 @@
+# Manifest for building a MicroPython image with the firmware modules frozen in.
+# Frozen modules run from flash, so their bytecode and constant objects take no RAM.
+# Build with:
+#   make -C ports/rp2 BOARD=RPI_PICO FROZEN_MANIFEST=/path/to/firmware/manifest.py
+# main.py stays on the filesystem.
+include("$(PORT_DIR)/boards/manifest.py")
+module("gpio_config.py")
+module("pwm.py")
+module("_tables.py")
+module("decode.py")
@@ -1,4 +1,5 @@
 import machine
+from machine import mem32
 from micropython import const
 from gpio_config import PIN_BUZZER1, PIN_BUZZER2
 
@@ -7,6 +8,9 @@ PWM_DUTY_CYCLE = const(32768)  # 50%
 
 # Global register EN has an alias of the CSR_EN flag for each slice.
 PWM_EN = const(0x400500A0)  # bits 0-7 are the enable bits for each PWM slice
+# Atomic aliases of EN: writing a 1 bit sets or clears just that bit.
+PWM_EN_SET = const(PWM_EN + 0x2000)
+PWM_EN_CLEAR = const(PWM_EN + 0x3000)
 
 pwm1 = None
 pwm2 = None
@@ -30,6 +34,6 @@ def initialize_pwm():
 
 def enable_pwm(enable=True):
     if enable:
-        machine.mem32[PWM_EN] |= 0x40  # enable slice 6
+        mem32[PWM_EN_SET] = 0x40  # enable slice 6
     else:
-        machine.mem32[PWM_EN] &= ~0x40  # disable slice 6
+        mem32[PWM_EN_CLEAR] = 0x40  # disable slice 6
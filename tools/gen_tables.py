@@ -0,0 +1,66 @@
+# Generate firmware/_tables.py, the segment decode tables used by firmware/decode.py.
+# Run on the host from the repository root after changing the segment patterns below:
+#   python tools/gen_tables.py
+# The tables are indexed by the segment bits that decode.decode_digits() packs, PA into bit 0 through PG into bit 6,
+# so they do not depend on which GPIO pins the segments are wired to.
+import os
+
+OUTPUT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "firmware", "_tables.py")
+SEGMENTS = "ABCDEFG"
+
+# Tuples of (lit segments, digit).
+# Digits 2-6 are normal 7-segment digits.
+SEGMENT_LOOKUP = (
+    ("ABCDEF", 0),
+    ("BC", 1),
+    ("ABDEG", 2),
+    ("ABCDG", 3),
+    ("BCFG", 4),
+    ("ACDFG", 5),
+    ("ACDEFG", 6),
+    ("ABC", 7),
+    ("ABCDEFG", 8),
+    ("ABCFG", 9),
+)
+
+# Digit 1 is the +1 or -1 digit.
+SEGMENT_LOOKUP_DIGIT_1 = (
+    ("ABC", 1),  # positive 1
+    ("AC", 1),  # negative 1
+    ("BC", 0),  # positive 0
+    ("C", 0),  # negative 0
+)
+
+
+def pack(segments: str) -> int:
+    """Return the table index for the given lit segments."""
+    return sum(1 << SEGMENTS.index(segment) for segment in segments)
+
+
+def make_table(lookup: tuple) -> bytes:
+    """Return a 128-byte table mapping packed segments to digits; other patterns map to 0."""
+    table = bytearray(128)
+    for segments, digit in lookup:
+        table[pack(segments)] = digit
+    return bytes(table)
+
+
+def format_bytes(name: str, data: bytes) -> str:
+    """Format data as an assignment of a bytes literal, 16 bytes to a line."""
+    lines = [f"{name} = ("]
+    for i in range(0, len(data), 16):
+        lines.append('    b"' + "".join(f"\\x{b:02x}" for b in data[i : i + 16]) + '"')
+    lines.append(")")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
+        f.write("# Generated by tools/gen_tables.py; do not edit.\n")
+        f.write("# 128-entry tables indexed by the packed segment bits of decode.decode_digits(); unknown segment patterns decode as 0.\n")
+        f.write(format_bytes("SEG_TABLE", make_table(SEGMENT_LOOKUP)))
+        f.write(format_bytes("SEG_TABLE_DIGIT_1", make_table(SEGMENT_LOOKUP_DIGIT_1)))
+
+
+if __name__ == "__main__":
+    main()